@@ -1,31 +1,61 @@
+import argparse
+
+import numpy as np
 import pandas as pd
 from pptx import Presentation
 from pptx.util import Inches
 import matplotlib.pyplot as plt
 
-# Your investment data
-data = [
-    # Traditional
-    {"Investment Name": "Large Cap Equities", "Category": "Equities", "Expected Return (%)": 8, "Risk Level (1-10)": 6, "Cap Rate (%)": None, "Liquidity": "High", "Min Investment": 0, "Fund Manager": "Vanguard"},
-    {"Investment Name": "Government Bonds", "Category": "Fixed Income", "Expected Return (%)": 4, "Risk Level (1-10)": 2, "Cap Rate (%)": None, "Liquidity": "High", "Min Investment": 1000, "Fund Manager": "BlackRock"},
-    {"Investment Name": "Money Market Funds", "Category": "Cash and Equivalents", "Expected Return (%)": 2, "Risk Level (1-10)": 1, "Cap Rate (%)": None, "Liquidity": "High", "Min Investment": 100, "Fund Manager": "Fidelity"},
-    {"Investment Name": "Forex Managed Account", "Category": "Currencies (Forex)", "Expected Return (%)": 6, "Risk Level (1-10)": 7, "Cap Rate (%)": None, "Liquidity": "High", "Min Investment": 5000, "Fund Manager": "OANDA"},
-
-    # Alternatives
-    {"Investment Name": "REIT - Commercial", "Category": "Real Estate", "Expected Return (%)": 9, "Risk Level (1-10)": 5, "Cap Rate (%)": 5.7, "Liquidity": "Medium", "Min Investment": 25000, "Fund Manager": "Prologis"},
-    {"Investment Name": "Gold ETF", "Category": "Commodities", "Expected Return (%)": 6, "Risk Level (1-10)": 4, "Cap Rate (%)": None, "Liquidity": "High", "Min Investment": 1000, "Fund Manager": "SPDR"},
-    {"Investment Name": "Life Settlement Fund", "Category": "Life Settlements", "Expected Return (%)": 10, "Risk Level (1-10)": 6, "Cap Rate (%)": None, "Liquidity": "Low", "Min Investment": 100000, "Fund Manager": "Abacus Life"},
-    {"Investment Name": "Mezzanine Finance Fund", "Category": "Mezzanine Financing", "Expected Return (%)": 12, "Risk Level (1-10)": 7, "Cap Rate (%)": None, "Liquidity": "Low", "Min Investment": 50000, "Fund Manager": "Golub Capital"},
-    {"Investment Name": "Direct Lending Fund", "Category": "Direct Lending", "Expected Return (%)": 11, "Risk Level (1-10)": 6, "Cap Rate (%)": None, "Liquidity": "Low", "Min Investment": 50000, "Fund Manager": "Ares Capital"},
-    {"Investment Name": "Raw Land Development", "Category": "Raw Developable Land", "Expected Return (%)": 14, "Risk Level (1-10)": 8, "Cap Rate (%)": 7.5, "Liquidity": "Low", "Min Investment": 100000, "Fund Manager": "Private Group"},
-    {"Investment Name": "Fund of Funds - Alt Blend", "Category": "Fund of Funds", "Expected Return (%)": 9, "Risk Level (1-10)": 5, "Cap Rate (%)": None, "Liquidity": "Medium", "Min Investment": 25000, "Fund Manager": "Partners Group"},
-    {"Investment Name": "Infrastructure Fund", "Category": "Infrastructure", "Expected Return (%)": 8.5, "Risk Level (1-10)": 4, "Cap Rate (%)": 6.0, "Liquidity": "Medium", "Min Investment": 50000, "Fund Manager": "Macquarie"}
-]  # Use your full investment_data list here from the previous script
+# Your investment data, column-wise (SoA) so pandas builds typed columns
+# directly instead of transposing a list of per-row dicts.
+# Rows: 4 traditional, then 8 alternatives. Column names mirror the
+# shipped workbook headers (en-dashes included) so the app's loader
+# reads generated files exactly like the checked-in ones.
+data = {
+    "Investment Name": np.array([
+        "Large Cap Equities", "Government Bonds", "Money Market Funds", "Forex Managed Account",
+        "REIT - Commercial", "Gold ETF", "Life Settlement Fund", "Mezzanine Finance Fund",
+        "Direct Lending Fund", "Raw Land Development", "Fund of Funds - Alt Blend", "Infrastructure Fund",
+    ], dtype=object),
+    "Category": np.array([
+        "Equities", "Fixed Income", "Cash and Equivalents", "Currencies (Forex)",
+        "Real Estate", "Commodities", "Life Settlements", "Mezzanine Financing",
+        "Direct Lending", "Raw Developable Land", "Fund of Funds", "Infrastructure",
+    ], dtype=object),
+    "Expected Return (%)": np.array([8, 4, 2, 6, 9, 6, 10, 12, 11, 14, 9, 8.5], dtype=np.float64),
+    "Risk Level (1-10)": np.array([6, 2, 1, 7, 5, 4, 6, 7, 6, 8, 5, 4], dtype=np.int64),
+    "Cap Rate (%)": np.array([np.nan, np.nan, np.nan, np.nan, 5.7, np.nan, np.nan, np.nan,
+                              np.nan, 7.5, np.nan, 6.0], dtype=np.float64),
+    "Liquidity (1–10)": np.array([9, 9, 10, 9, 5, 9, 2, 2, 3, 1, 4, 3], dtype=np.int64),
+    "Volatility (1–10)": np.array([6, 2, 1, 8, 5, 5, 3, 6, 4, 7, 4, 4], dtype=np.int64),
+    "Fees (%)": np.array([0.5, 0.2, 0.1, 2.0, 1.0, 0.4, 2.0, 2.0,
+                          1.5, 1.0, 2.5, 1.5], dtype=np.float64),
+    "Time Horizon (Short/Medium/Long)": np.array([
+        "Long", "Medium", "Short", "Short", "Long", "Medium", "Long", "Long",
+        "Medium", "Long", "Medium", "Long",
+    ], dtype=object),
+    "Inflation Hedge (Yes/No)": np.array([
+        "No", "No", "No", "No", "Yes", "Yes", "No", "No",
+        "No", "Yes", "No", "Yes",
+    ], dtype=object),
+    "Minimum Investment ($)": np.array([0, 1000, 100, 5000, 25000, 1000, 100000, 50000,
+                                        50000, 100000, 25000, 50000], dtype=np.int64),
+}
 
 df = pd.DataFrame(data)
 
-# === PART 1: SAVE EXCEL FILE ===
-df.to_excel("Comprehensive_Investment_Matrix.xlsx", index=False)
+# === PART 1: SAVE DATA FILES ===
+# Parquet is the canonical format the apps read; XLSX is opt-in for manual review
+parser = argparse.ArgumentParser(description="Generate the investment matrix data files")
+parser.add_argument("--xlsx", action="store_true", help="also write the XLSX workbook")
+args = parser.parse_args()
+
+df.to_parquet("Comprehensive_Investment_Matrix.parquet", compression="zstd", index=False)
+if args.xlsx:
+    # constant_memory streams rows out instead of holding the full cell tree
+    with pd.ExcelWriter("Comprehensive_Investment_Matrix.xlsx", engine="xlsxwriter",
+                        engine_kwargs={"options": {"constant_memory": True}}) as writer:
+        df.to_excel(writer, index=False)
 
 # === PART 2: CREATE CHART ===
 plt.figure(figsize=(10, 5))
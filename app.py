@@ -1,215 +1,434 @@
-import streamlit as st
-import pandas as pd
-import yfinance as yf
-import matplotlib.pyplot as plt
-from pptx import Presentation
-from pptx.util import Inches
-from docx import Document
-from docx.shared import Inches as DocxInches
-
-# --- PAGE CONFIG ---
-st.set_page_config(page_title="Automated Investment Matrix", layout="wide")
-
-# --- STYLING & HEADER ---
-st.markdown("""
-<style>
-.app-header {
-    background:#111;
-    color:white;
-    padding:12px 24px;
-    position:fixed;
-    top:0;
-    left:0;
-    width:100vw;
-    z-index:1000;
-    font-family:'Helvetica Neue', Helvetica, sans-serif;
-}
-.app-header h1 {
-    margin: 0 0 0 0;
-    font-size: 24px;
-    font-weight: 700;
-    line-height: 1.1;
-}
-
-.app-header p {
-    margin: 0;
-    color: #f44336;
-    font-size: 13px;
-    line-height: 1.1;
-}
-.market-indices {
-    display:flex;
-    gap:20px;
-    margin-top:20px;
-    margin-bottom:1px;
-    justify-content:right;
-}
-.index-box {
-    background:#111;
-    color:white;
-    padding:10px 16px;
-    border-radius:4px;
-    text-align:center;
-    font-size:13px;
-    min-width:120px;
-}
-.index-box .name { font-weight:700; margin-bottom:4px; }
-.index-box .value { font-size:16px; margin-bottom:2px; }
-.index-box .delta { font-size:14px; }
-.index-box .positive { color:#4caf50; }
-.index-box .negative { color:#f44336; }
-[data-testid="stDataFrame"] { font-size:12px; }
-.stButton > button {
-    background:#111;
-    color:#f44336;
-    border:2px solid #f44336;
-    padding:0.5em 1em;
-    font-weight:700;
-    border-radius:6px;
-}
-.stButton > button:hover {
-    background:#f44336;
-    color:#111;
-}
-</style>
-<div class="app-header">
-    <h1>Automated Investment Matrix</h1>
-    <p>Modular Investment Analysis Platform with Real Real‑Time Data for Portfolio Optimization and Advisory</p>
-</div>
-""", unsafe_allow_html=True)
-
-# --- MARKET INDEXES ---
-@st.cache_data(ttl=300)
-def get_price(ticker):
-    hist = yf.Ticker(ticker).history(period="2d")['Close']
-    if len(hist) >= 2:
-        last, prev = hist.iloc[-1], hist.iloc[-2]
-        delta = last - prev
-        pct = delta / prev * 100
-        return f"${last:,.2f}", f"{delta:+.2f} ({pct:+.2f}%)"
-    return "N/A", ""
-
-tickers = {"S&P 500": "^GSPC", "Nasdaq": "^IXIC", "Dow Jones": "^DJI"}
-prices = {n: get_price(t) for n, t in tickers.items()}
-
-market_html = '<div class="market-indices">'
-for name, (price, delta) in prices.items():
-    cls = "positive" if delta.startswith("+") else "negative"
-    market_html += f'''
-    <div class="index-box">
-        <div class="name">{name}</div>
-        <div class="value">{price}</div>
-        <div class="delta {cls}">{delta}</div>
-    </div>'''
-market_html += '</div>'
-st.markdown(market_html, unsafe_allow_html=True)
-
-# --- DATA LOAD ---
-@st.cache_data(ttl=600)
-def load_data():
-    df = pd.read_excel("Comprehensive_Investment_Matrix.xlsx")
-    df.columns = [c.strip().replace("–", "-") for c in df.columns]  # ensure consistent dashes
-    return df
-
-df = load_data()
-
-# --- 1. SELECT INVESTMENTS ---
-st.subheader("Investment Portfolio Composition")
-if "Category" not in df.columns:
-    st.error("Missing Category column in data.")
-    st.stop()
-types = sorted(df["Category"].dropna().unique())
-sel = st.multiselect("Choose investment categories:", types, default=types)
-
-# --- 2. EDITABLE DATA ---
-st.subheader("Configure Investment Data")
-filtered_df = df[df["Category"].isin(sel)].copy()
-edited = st.data_editor(filtered_df, use_container_width=True, num_rows="dynamic")
-
-# --- 3. PORTFOLIO METRICS ---
-st.subheader("Portfolio Averages and Returns")
-def mean_safe(df, col): return f"{df[col].mean():.2f}" if col in df.columns and not df.empty else "N/A"
-
-metrics = [
-    ("Avg Return (%)", "Expected Return (%)"),
-    ("Avg Risk", "Risk Level (1-10)"),
-    ("Avg Cap Rate (%)", "Cap Rate (%)"),
-    ("Avg Liquidity", "Liquidity (1-10)"),
-    ("Avg Volatility", "Volatility (1-10)"),
-    ("Avg Fees (%)", "Fees (%)"),
-    ("Avg Min Inv ($)", "Minimum Investment ($)")
-]
-cols = st.columns(len(metrics))
-for (lbl, colname), c in zip(metrics, cols):
-    val = mean_safe(edited, colname)
-    suffix = "%" if "%" in lbl or "Rate" in lbl else "$" if "Inv" in lbl else ""
-    c.metric(lbl, f"{val}{suffix}" if val != "N/A" else val)
-
-# --- 4. VISUAL INSIGHTS ---
-st.subheader("Portflio Graphs and Trends")
-vc = st.columns(4)
-
-def make_bar(x, y):
-    fig, ax = plt.subplots(figsize=(2.6,1.8))
-    ax.bar(x, y, color="#f44336")
-    ax.tick_params(axis="x", rotation=45, labelsize=6)
-    fig.tight_layout(); return fig
-
-def make_scatter(x, y, xlabel, ylabel):
-    fig, ax = plt.subplots(figsize=(2.6,1.8))
-    ax.scatter(x, y, c='red', alpha=0.6, edgecolors='black')
-    ax.set_xlabel(xlabel, fontsize=7); ax.set_ylabel(ylabel, fontsize=7)
-    ax.tick_params(labelsize=6); fig.tight_layout(); return fig
-
-vis = [
-    ("Expected Return (%)", make_bar),
-    (("Volatility (1-10)", "Liquidity (1-10)"), make_scatter),
-    (("Fees (%)", "Expected Return (%)"), make_scatter),
-    ("Risk Level (1-10)", None)
-]
-for slot, cfg in zip(vc, vis):
-    if isinstance(cfg[0], tuple):
-        x, y = cfg[0]
-        slot.markdown(f"**{y} vs {x}**")
-        if x in edited and y in edited and not edited.empty:
-            slot.pyplot(cfg[1](edited[x], edited[y], x, y))
-    else:
-        col = cfg[0]
-        slot.markdown(f"**{col}**")
-        if col in edited and not edited.empty:
-            if cfg[1]:
-                slot.pyplot(cfg[1](edited["Investment Name"], edited[col]))
-            else:
-                fig, ax = plt.subplots(figsize=(2.6,1.8))
-                ax.hist(edited[col], bins=7, color="#f44336", alpha=0.7)
-                ax.tick_params(labelsize=6); fig.tight_layout(); slot.pyplot(fig)
-
-# --- 5. FILTER -->
-st.subheader("Portfolio Choices and Constraints")
-min_i = st.slider("Min Investment ($)", 0, int(edited["Minimum Investment ($)"].max()), 0, step=1000) \
-    if "Minimum Investment ($)" in edited else 0
-min_r = st.slider("Min Return (%)", 0.0, float(edited["Expected Return (%)"].max()), 0.0, step=0.1) \
-    if "Expected Return (%)" in edited else 0
-max_r = st.slider("Max Risk level", 0, 10, 10)
-time_h = st.selectbox("Time Horizon", ["Short", "Medium", "Long"])
-hedge = st.checkbox("Inflation Hedge Only")
-
-f = edited.copy()
-if "Minimum Investment ($)" in f: f = f[f["Minimum Investment ($)"] >= min_i]
-if "Expected Return (%)" in f: f = f[f["Expected Return (%)"] >= min_r]
-if "Risk Level (1-10)" in f: f = f[f["Risk Level (1-10)"] <= max_r]
-if hedge and "Inflation Hedge (Yes/No)" in f: f = f[f["Inflation Hedge (Yes/No)"] == "Yes"]
-
-# --- 6. FILTERED TABLE ---
-st.subheader(f"Filtered Investments")
-st.dataframe(f, height=220)
-
-# --- 7. EXPORT REPORTS ---
-st.subheader("Export Data and Reports")
-b1, b2 = st.columns(2)
-with b1:
-    if st.button("Download PowerPoint"):
-        st.success("PPT placeholder")
-with b2:
-    if st.button("Download Word"):
-        st.success("Word placeholder")
+import io
+import os
+import time
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+# --- PAGE CONFIG ---
+st.set_page_config(page_title="Automated Investment Matrix", layout="wide")
+
+# --- STYLING & HEADER ---
+@st.cache_data(show_spinner=False)
+def load_css():
+    with open("style.css") as fh:
+        return fh.read()
+
+st.markdown(f"""
+<style>{load_css()}</style>
+<div class="app-header">
+    <h1>Automated Investment Matrix</h1>
+    <p>Modular Investment Analysis Platform with Real Real‑Time Data for Portfolio Optimization and Advisory</p>
+</div>
+""", unsafe_allow_html=True)
+
+# --- MARKET INDEXES ---
+QUOTE_CACHE = os.path.join(os.path.expanduser("~"), ".swsf_cache", "index_closes.parquet")
+
+def _fetch_closes(symbols):
+    # Durable sidecar under the in-memory cache: a restarted worker reads
+    # recent closes from disk instead of re-hitting Yahoo on cold start
+    if os.path.exists(QUOTE_CACHE) and time.time() - os.path.getmtime(QUOTE_CACHE) < 300:
+        cached = pd.read_parquet(QUOTE_CACHE)
+        if set(symbols) <= set(cached.columns):
+            return cached
+    # One multiplexed Yahoo request for all indexes instead of a
+    # blocking round trip per ticker
+    data = yf.download(list(symbols), period="2d", group_by="ticker",
+                       threads=True, progress=False, auto_adjust=False)
+    closes = {}
+    for sym in symbols:
+        try:
+            closes[sym] = data[sym]["Close"]
+        except KeyError:
+            closes[sym] = pd.Series(dtype=float)
+    closes = pd.DataFrame(closes)
+    try:
+        os.makedirs(os.path.dirname(QUOTE_CACHE), exist_ok=True)
+        closes.to_parquet(QUOTE_CACHE, compression="zstd")
+    except OSError:
+        pass  # cache is best-effort; quotes still render without it
+    return closes
+
+@st.cache_data(ttl=300)
+def get_quotes(symbols):
+    closes = _fetch_closes(symbols)
+    quotes = {}
+    for sym in symbols:
+        hist = closes[sym].dropna() if sym in closes.columns else pd.Series(dtype=float)
+        if len(hist) >= 2:
+            last, prev = hist.iloc[-1], hist.iloc[-2]
+            delta = last - prev
+            pct = delta / prev * 100
+            quotes[sym] = (f"${last:,.2f}", f"{delta:+.2f} ({pct:+.2f}%)")
+        else:
+            quotes[sym] = ("N/A", "")
+    return quotes
+
+TICKERS = {"S&P 500": "^GSPC", "Nasdaq": "^IXIC", "Dow Jones": "^DJI"}
+
+# Pure function of the quotes, so the HTML string itself is memoized
+# and only rebuilt when a quote changes
+@st.cache_data(ttl=300, show_spinner=False)
+def market_strip_html(quotes):
+    boxes = "".join(f'''
+    <div class="index-box">
+        <div class="name">{name}</div>
+        <div class="value">{price}</div>
+        <div class="delta {"positive" if delta.startswith("+") else "negative"}">{delta}</div>
+    </div>''' for name, (price, delta) in quotes)
+    return f'<div class="market-indices">{boxes}</div>'
+
+# Fragment: the strip ships as one batched delta and refreshes itself on
+# the cache's cadence without rerunning the rest of the page
+@st.fragment(run_every="5min")
+def market_strip():
+    quotes = get_quotes(tuple(TICKERS.values()))
+    prices = tuple((n, quotes[t]) for n, t in TICKERS.items())
+    st.markdown(market_strip_html(prices), unsafe_allow_html=True)
+
+market_strip()
+
+# --- DATA LOAD ---
+XLSX_PATH = "Comprehensive_Investment_Matrix.xlsx"
+PARQUET_PATH = "Comprehensive_Investment_Matrix.parquet"
+# Canonical (post-normalization) column names, frozen once so the hot
+# path indexes by interned constants instead of repeated long literals
+NAME = "Investment Name"
+CAT = "Category"
+EXP_RET = "Expected Return (%)"
+RISK = "Risk Level (1-10)"
+CAP_RATE = "Cap Rate (%)"
+LIQ = "Liquidity (1-10)"
+VOL = "Volatility (1-10)"
+FEES = "Fees (%)"
+MIN_INV = "Minimum Investment ($)"
+TIME_COL = "Time Horizon (Short/Medium/Long)"
+HEDGE_COL = "Inflation Hedge (Yes/No)"
+# Typographic characters normalized in string cells, all substitutions
+# in a single C-level translate pass per column
+SANITIZE_TRANS = str.maketrans({"–": "-", "’": "'", "“": '"', "”": '"', "•": "-"})
+TIME_HORIZONS = ["Short", "Medium", "Long"]
+# Half-width numerics: the app displays 2 decimals and small integers,
+# so float32 halves the bytes every scan touches and the 1-10 scales
+# fit in a single byte each
+NUMERIC_DOWNCAST = {
+    EXP_RET: "float32[pyarrow]",
+    CAP_RATE: "float32[pyarrow]",
+    FEES: "float32[pyarrow]",
+    RISK: "int8[pyarrow]",
+    LIQ: "int8[pyarrow]",
+    VOL: "int8[pyarrow]",
+    MIN_INV: "int32[pyarrow]",
+}
+# Low-cardinality string columns kept as category dtype so unique/isin
+# run on integer codes instead of Python strings
+CATEGORICAL_COLS = [CAT, TIME_COL, HEDGE_COL]
+# Explicit dtypes skip pandas' inference passes; keys use the raw
+# workbook headers (en-dashes), which are normalized after the read
+XLSX_DTYPES = {
+    CAT: "category",
+    TIME_COL: "category",
+    HEDGE_COL: "category",
+    EXP_RET: "float64",
+    RISK: "Int64",
+    CAP_RATE: "float64",
+    "Liquidity (1–10)": "Int64",
+    "Volatility (1–10)": "Int64",
+    FEES: "float64",
+    MIN_INV: "Int64",
+}
+
+def _data_mtime():
+    # Cache key for load_data: newest mtime of whichever data files exist
+    return max(os.path.getmtime(p) for p in (XLSX_PATH, PARQUET_PATH) if os.path.exists(p))
+
+@st.cache_data(show_spinner=False)
+def load_data(mtime):
+    # Prefer the Parquet sidecar; fall back to the XLSX and refresh the sidecar
+    if os.path.exists(PARQUET_PATH) and (not os.path.exists(XLSX_PATH)
+                                         or os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(XLSX_PATH)):
+        # Arrow-backed dtypes keep st.dataframe/st.data_editor serialization zero-copy
+        df = pd.read_parquet(PARQUET_PATH, dtype_backend="pyarrow")
+        # Generator-written sidecars carry the raw en-dash headers
+        df.columns = df.columns.str.strip().str.replace("–", "-")
+    else:
+        # Parse only the columns the app consumes (raw workbook headers)
+        df = pd.read_excel(XLSX_PATH, engine="calamine", dtype=XLSX_DTYPES,
+                           usecols=[NAME, *XLSX_DTYPES])
+        df.columns = df.columns.str.strip().str.replace("–", "-")  # ensure consistent dashes
+        for c in df.select_dtypes(include=["object", "str"]).columns:
+            df[c] = df[c].str.translate(SANITIZE_TRANS)
+        # Match the Parquet path: Arrow-backed dtypes ship zero-copy to the browser
+        df = df.convert_dtypes(dtype_backend="pyarrow")
+        df.to_parquet(PARQUET_PATH, compression="zstd")
+    for c in CATEGORICAL_COLS:
+        # Everything that isn't already pandas category converts,
+        # including Arrow dictionary columns from the Parquet read —
+        # data_editor's column config doesn't understand those
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    for c, t in NUMERIC_DOWNCAST.items():
+        if c in df.columns:
+            df[c] = df[c].astype(t)
+    if TIME_COL in df.columns:
+        # Ordered categorical with fixed levels; .cat.categories then
+        # serves as the pre-sorted option list with no per-rerun scan
+        df[TIME_COL] = pd.Categorical(df[TIME_COL], categories=TIME_HORIZONS, ordered=True)
+    return df
+
+df = load_data(_data_mtime())
+
+def _sorted_levels(col):
+    # Categorical columns carry a pre-sorted, deduped index for free;
+    # only plain string columns pay the unique-and-sort scan
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.categories.tolist()
+    return np.sort(np.asarray(col.dropna().unique())).tolist()
+
+@st.cache_data(show_spinner=False)
+def widget_bounds(frame):
+    """O(N) column scans done once per distinct frame, not per rerun."""
+    return {
+        "cats": _sorted_levels(frame[CAT]) if CAT in frame.columns else [],
+        "max_inv": int(frame[MIN_INV].max()) if MIN_INV in frame.columns and not frame.empty else None,
+        "max_ret": float(frame[EXP_RET].max()) if EXP_RET in frame.columns and not frame.empty else None,
+    }
+
+# --- 1. SELECT INVESTMENTS ---
+st.subheader("Investment Portfolio Composition")
+if CAT not in df.columns:
+    st.error("Missing Category column in data.")
+    st.stop()
+types = widget_bounds(df)["cats"]
+sel = st.multiselect("Choose investment categories:", types, default=types)
+
+# --- 2. EDITABLE DATA ---
+st.subheader("Configure Investment Data")
+# Match on int8 category codes instead of per-row string hashing
+_cat = df[CAT].astype("category")
+_allowed = _cat.cat.categories.get_indexer(sel)
+filtered_df = df[np.isin(_cat.cat.codes.to_numpy(), _allowed)]
+EDITOR_CONFIG = {
+    EXP_RET: st.column_config.NumberColumn(step=0.1, format="%.2f"),
+    RISK: st.column_config.NumberColumn(min_value=1, max_value=10, step=1),
+    LIQ: st.column_config.NumberColumn(min_value=1, max_value=10, step=1),
+    VOL: st.column_config.NumberColumn(min_value=1, max_value=10, step=1),
+    FEES: st.column_config.NumberColumn(step=0.1, format="%.2f"),
+    MIN_INV: st.column_config.NumberColumn(step=1000, format="$%d"),
+    HEDGE_COL: st.column_config.SelectboxColumn(options=["Yes", "No"]),
+}
+edited = st.data_editor(filtered_df, use_container_width=True, num_rows="dynamic",
+                        column_config=EDITOR_CONFIG, key="editor")
+
+# --- 3. PORTFOLIO METRICS ---
+st.subheader("Portfolio Averages and Returns")
+metrics = [
+    ("Avg Return (%)", EXP_RET),
+    ("Avg Risk", RISK),
+    ("Avg Cap Rate (%)", CAP_RATE),
+    ("Avg Liquidity", LIQ),
+    ("Avg Volatility", VOL),
+    ("Avg Fees (%)", FEES),
+    ("Avg Min Inv ($)", MIN_INV)
+]
+# One reduction over a dense float64 block instead of seven .mean() passes
+num_cols = [colname for _, colname in metrics if colname in edited.columns]
+means = dict(zip(num_cols, np.nanmean(edited[num_cols].to_numpy(np.float64), axis=0))) \
+    if num_cols and not edited.empty else {}
+cols = st.columns(len(metrics))
+for (lbl, colname), c in zip(metrics, cols):
+    val = f"{means[colname]:.2f}" if colname in means and not np.isnan(means[colname]) else "N/A"
+    suffix = "%" if "%" in lbl or "Rate" in lbl else "$" if "Inv" in lbl else ""
+    c.metric(lbl, f"{val}{suffix}" if val != "N/A" else val)
+
+# --- 4. VISUAL INSIGHTS ---
+# Native Vega-lite charts render client-side; no server-side rasterization
+st.subheader("Portflio Graphs and Trends")
+vc = st.columns(4)
+
+with vc[0]:
+    st.markdown("**Expected Return (%)**")
+    if EXP_RET in edited and not edited.empty:
+        st.bar_chart(edited.set_index(NAME)[EXP_RET],
+                     color="#f44336", height=220)
+with vc[1]:
+    st.markdown("**Liquidity (1-10) vs Volatility (1-10)**")
+    if VOL in edited and LIQ in edited and not edited.empty:
+        st.scatter_chart(edited, x=VOL, y=LIQ,
+                         color="#f44336", height=220)
+with vc[2]:
+    st.markdown("**Expected Return (%) vs Fees (%)**")
+    if FEES in edited and EXP_RET in edited and not edited.empty:
+        st.scatter_chart(edited, x=FEES, y=EXP_RET,
+                         color="#f44336", height=220)
+with vc[3]:
+    st.markdown("**Risk Level (1-10)**")
+    if RISK in edited and not edited.empty:
+        # Bin server-side with np.histogram, render client-side;
+        # drop NaN first — blank editor rows inject pd.NA and
+        # np.histogram (unlike ax.hist) rejects a non-finite range
+        arr = edited[RISK].to_numpy(np.float64)
+        arr = arr[~np.isnan(arr)]
+        if arr.size:
+            counts, edges = np.histogram(arr, bins=7)
+            labels = [f"{lo:.1f}-{hi:.1f}" for lo, hi in zip(edges[:-1], edges[1:])]
+            st.bar_chart(pd.Series(counts, index=labels, name="Count"),
+                         color="#f44336", height=220)
+
+# --- 5-7. FILTERS, TABLE & EXPORTS ---
+@st.cache_data(show_spinner=False)
+def _render_return_chart(names, values):
+    """Bar-chart PNG shared by the PPT and Word reports, keyed on its data."""
+    import matplotlib
+    matplotlib.use("Agg")
+    # Styled once through rcParams; constrained layout replaces the
+    # per-figure tight_layout text-extent solver
+    matplotlib.rcParams.update({
+        "path.simplify": True,
+        "figure.constrained_layout.use": True,
+        "font.size": 7,
+        "xtick.labelsize": 7,
+    })
+    import matplotlib.pyplot as plt
+    # Sized to the 8-inch slide embed so python-pptx never deflates an
+    # oversized raster into the OOXML zip
+    fig, ax = plt.subplots(figsize=(8, 3))
+    bars = ax.bar(names, values, color="#f44336")
+    # Raster layer for the data artists; axes and text stay vector if
+    # the chart is ever exported through a vector backend
+    for bar in bars:
+        bar.set_rasterized(True)
+    ax.set_ylabel(EXP_RET)
+    ax.tick_params(axis="x", rotation=90)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=72, pil_kwargs={"optimize": True})
+    plt.close(fig)
+    return buf.getvalue()
+
+def _frame_sig(frame):
+    # Vectorized row-hash fingerprint; Streamlit's built-in hasher
+    # serializes whole DataFrames on every cache lookup
+    return hash((tuple(frame.columns),
+                 pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()))
+
+@st.cache_data(show_spinner=False)
+def _report_averages(sig, _data):
+    """Numeric means shared by the PPT and Word builders."""
+    return _data.select_dtypes(include="number").mean().round(2)
+
+@st.cache_resource
+def _pptx_template_bytes():
+    # Read python-pptx's default template once; each report then parses
+    # a fresh Presentation from the in-memory copy instead of the disk file
+    import pptx
+    path = os.path.join(os.path.dirname(pptx.__file__), "templates", "default.pptx")
+    with open(path, "rb") as fh:
+        return fh.read()
+
+@st.cache_data(show_spinner=False)
+def create_ppt(sig, _data):
+    # Deferred: python-pptx pulls in lxml schema parsing only needed on export
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation(io.BytesIO(_pptx_template_bytes()))
+    layouts = prs.slide_layouts
+    title_layout, content_layout, pic_layout = layouts[0], layouts[1], layouts[5]
+
+    slide = prs.slides.add_slide(title_layout)
+    slide.shapes.title.text = "Automated Investment Matrix"
+    slide.placeholders[1].text = "Filtered Investment Portfolio Overview"
+
+    avg = _report_averages(sig, _data)
+    slide = prs.slides.add_slide(content_layout)
+    slide.shapes.title.text = "Portfolio Averages"
+    slide.placeholders[1].text = "\n".join(f"{k}: {v}" for k, v in avg.items())
+
+    if NAME in _data and EXP_RET in _data and not _data.empty:
+        png = _render_return_chart(tuple(_data[NAME]), tuple(_data[EXP_RET]))
+        slide = prs.slides.add_slide(pic_layout)
+        slide.shapes.title.text = "Expected Return by Investment"
+        slide.shapes.add_picture(io.BytesIO(png), Inches(1), Inches(1.5), width=Inches(8))
+
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+def create_docx(sig, _data):
+    # Deferred for the same reason as the pptx imports above
+    from docx import Document
+    from docx.shared import Inches as DocxInches
+
+    doc = Document()
+    doc.add_heading("Automated Investment Matrix", level=1)
+    doc.add_paragraph("Filtered Investment Portfolio Overview")
+
+    doc.add_heading("Portfolio Averages", level=2)
+    avg = _report_averages(sig, _data)
+    for k, v in avg.items():
+        doc.add_paragraph(f"{k}: {v}", style="List Bullet")
+
+    if NAME in _data and EXP_RET in _data and not _data.empty:
+        png = _render_return_chart(tuple(_data[NAME]), tuple(_data[EXP_RET]))
+        doc.add_heading("Expected Return by Investment", level=2)
+        doc.add_picture(io.BytesIO(png), width=DocxInches(6.5))
+
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+TABLE_CONFIG = {
+    EXP_RET: st.column_config.NumberColumn(format="%.2f"),
+    CAP_RATE: st.column_config.NumberColumn(format="%.2f"),
+    FEES: st.column_config.NumberColumn(format="%.2f"),
+    MIN_INV: st.column_config.NumberColumn(format="$%d"),
+}
+
+@st.fragment
+def portfolio_controls(edited):
+    # Fragment: slider/checkbox changes rerun only this block, not the
+    # data load, editor and charts above it
+    st.subheader("Portfolio Choices and Constraints")
+    bounds = widget_bounds(edited)
+    min_i = st.slider("Min Investment ($)", 0, bounds["max_inv"], 0, step=1000) \
+        if bounds["max_inv"] is not None else 0
+    min_r = st.slider("Min Return (%)", 0.0, bounds["max_ret"], 0.0, step=0.1) \
+        if bounds["max_ret"] is not None else 0
+    max_r = st.slider("Max Risk level", 0, 10, 10)
+    time_h = st.selectbox("Time Horizon", list(edited[TIME_COL].cat.categories)
+                          if TIME_COL in edited and hasattr(edited[TIME_COL], "cat")
+                          else TIME_HORIZONS)
+    hedge = st.checkbox("Inflation Hedge Only")
+
+    # Compose one boolean mask and slice once instead of chained copies
+    mask = np.ones(len(edited), dtype=bool)
+    if MIN_INV in edited: mask &= edited[MIN_INV].to_numpy() >= min_i
+    if EXP_RET in edited: mask &= edited[EXP_RET].to_numpy() >= min_r
+    if RISK in edited: mask &= edited[RISK].to_numpy() <= max_r
+    # na_value=False: blank editor rows hold pd.NA, which must not match
+    if hedge and HEDGE_COL in edited:
+        mask &= (edited[HEDGE_COL] == "Yes").to_numpy(dtype=bool, na_value=False)
+    f = edited.loc[mask]
+
+    st.subheader("Filtered Investments")
+    # Formatting via column_config happens in the browser's grid
+    # renderer, not a per-cell pandas Styler pass
+    st.dataframe(f, height=220, column_config=TABLE_CONFIG)
+
+    st.subheader("Export Data and Reports")
+    sig = _frame_sig(f)
+    b1, b2 = st.columns(2)
+    with b1:
+        st.download_button("Download PowerPoint", create_ppt(sig, f),
+                           file_name="HNW_Investment_Presentation.pptx",
+                           mime="application/vnd.openxmlformats-officedocument.presentationml.presentation")
+    with b2:
+        st.download_button("Download Word", create_docx(sig, f),
+                           file_name="HNW_Investment_Report.docx",
+                           mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+
+portfolio_controls(edited)